@@ -9,7 +9,7 @@ from z3 import Not, sat
 from dobutsu_shogi_z3.core import MoveData, PieceState, Player, TimeIndex
 from dobutsu_shogi_z3.z3_constraints import GameRules
 
-from .utils import create_base_solver, extract_moves
+from .utils import create_base_solver, extract_moves, find_lion_id
 
 
 # Problem Types
@@ -45,6 +45,13 @@ class CheckmateSolver:
         if last_player != problem.winning_player.value:
             return None
 
+        # Both Lions must be on the board
+        losing_player = Player.GOTE if problem.winning_player == Player.SENTE else Player.SENTE
+        own_lion_id = find_lion_id(problem.initial_state, problem.winning_player)
+        opponent_lion_id = find_lion_id(problem.initial_state, losing_player)
+        if own_lion_id is None or opponent_lion_id is None:
+            return None
+
         solver, state = create_base_solver(problem.max_moves, problem.initial_state)
 
         # Add victory condition at the end for winning player
@@ -52,13 +59,17 @@ class CheckmateSolver:
             state,
             TimeIndex(problem.max_moves),
             problem.winning_player,
+            own_lion_id,
+            opponent_lion_id,
         )
         solver.add(victory_condition)
 
         # No victory before final move
         for _t in range(problem.max_moves):
             t = TimeIndex(_t)
-            solver.add(Not(GameRules.victory_conditions(state, t, problem.winning_player)))
+            solver.add(
+                Not(GameRules.victory_conditions(state, t, problem.winning_player, own_lion_id, opponent_lion_id)),
+            )
 
         if solver.check() == sat:
             model = solver.model()
@@ -50,7 +50,7 @@ class ReachabilitySolver:
                 state.piece_row[t, problem.piece_id] == problem.target.row,
                 state.piece_col[t, problem.piece_id] == problem.target.col,
                 state.piece_owner[t, problem.piece_id] == problem.player.value,
-                state.piece_captured[t, problem.piece_id] == False,
+                state.on_board(t, problem.piece_id),
             )
             reachability_conditions.append(piece_at_target)
 
@@ -67,7 +67,7 @@ class ReachabilitySolver:
                     model[state.piece_row[t, problem.piece_id]].as_long() == problem.target.row
                     and model[state.piece_col[t, problem.piece_id]].as_long() == problem.target.col
                     and model[state.piece_owner[t, problem.piece_id]].as_long() == problem.player.value
-                    and not model[state.piece_captured[t, problem.piece_id]]
+                    and model[state.piece_in_hand_of[t, problem.piece_id]].as_long() < 0
                 ):
                     reached_time = _t
                     break
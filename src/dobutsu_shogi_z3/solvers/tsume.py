@@ -2,17 +2,34 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from typing import TYPE_CHECKING
 
-from z3 import And, sat
+from z3 import And, Context, Solver, main_ctx, sat
 
 from .utils import create_base_solver, extract_moves
 
 if TYPE_CHECKING:
+    from z3 import ModelRef
     from z3.z3 import BoolRef
 
     from dobutsu_shogi_z3.core import MoveData, PieceState
+    from dobutsu_shogi_z3.z3_models import GameState
+
+# Canonical identity of a base position: (initial state, max moves)
+type _BaseKey = tuple[tuple[PieceState, ...], int]
+
+# Canonical identity of a Tsume problem: (initial state, max moves, constraint S-expressions)
+type _ProblemKey = tuple[tuple[PieceState, ...], int, tuple[str, ...]]
+
+# Maximum number of solved problems kept in a solver's transposition table
+TRANSPOSITION_TABLE_SIZE = 1024
+
+# Maximum number of positions whose base and worker solvers a solver keeps alive
+BASE_SOLVER_CACHE_SIZE = 8
 
 
 @dataclass(frozen=True)
@@ -32,52 +49,187 @@ class TsumeSolution:
     satisfied_constraints: list[BoolRef]
 
 
+def _base_key(problem: TsumeProblem) -> _BaseKey:
+    """Build a hashable key identifying the base position of a Tsume problem."""
+    return (
+        tuple(sorted(problem.initial_state, key=lambda piece_state: piece_state.piece_id)),
+        problem.max_moves,
+    )
+
+
+def _problem_key(problem: TsumeProblem) -> _ProblemKey:
+    """Build a hashable key identifying equivalent Tsume problems."""
+    return (*_base_key(problem), tuple(constraint.sexpr() for constraint in problem.constraints))
+
+
+def _copy_solution(solution: TsumeSolution | None) -> TsumeSolution | None:
+    """Copy the lists of a solution, so callers cannot mutate a cached one."""
+    if solution is None:
+        return None
+    return replace(
+        solution,
+        moves=list(solution.moves),
+        satisfied_constraints=list(solution.satisfied_constraints),
+    )
+
+
 class TsumeSolver:
     """General constraint-based problem solver."""
 
+    def __init__(self) -> None:
+        """Initialize the solver with an empty transposition table."""
+        # Results of previously solved problems, kept across `solve` calls in LRU order
+        self._transposition_table: OrderedDict[_ProblemKey, TsumeSolution | None] = OrderedDict()
+        # Solvers holding the base constraints of each position, reused via push/pop, in LRU order
+        self._base_solvers: OrderedDict[_BaseKey, tuple[Solver, GameState]] = OrderedDict()
+        # Copies of the base solvers in private Z3 contexts, one per worker thread
+        self._worker_solvers: dict[_BaseKey, list[Solver]] = {}
+
+    def _get_base_solver(self, problem: TsumeProblem) -> tuple[Solver, GameState]:
+        """Get the solver with the base constraints of the problem's position."""
+        key = _base_key(problem)
+        if key in self._base_solvers:
+            self._base_solvers.move_to_end(key)
+            return self._base_solvers[key]
+
+        self._base_solvers[key] = create_base_solver(problem.max_moves, problem.initial_state)
+        if len(self._base_solvers) > BASE_SOLVER_CACHE_SIZE:
+            # Worker solvers are copies of the evicted base solver, so they go with it
+            evicted_key, _ = self._base_solvers.popitem(last=False)
+            self._worker_solvers.pop(evicted_key, None)
+        return self._base_solvers[key]
+
+    def _get_worker_solvers(self, problem: TsumeProblem, count: int) -> list[Solver]:
+        """Get at least `count` copies of the base solver, each in its own Z3 context."""
+        base_solver, _ = self._get_base_solver(problem)
+        workers = self._worker_solvers.setdefault(_base_key(problem), [])
+        if len(workers) < count:
+            # Re-parsing the SMT-LIB2 dump is much cheaper than Solver.translate
+            base_smt2 = base_solver.sexpr()
+            for _ in range(count - len(workers)):
+                worker = Solver(ctx=Context())
+                worker.from_string(base_smt2)
+                workers.append(worker)
+        return workers
+
     def solve(self, problem: TsumeProblem) -> TsumeSolution | None:
         """Solve general Tsume problem."""
         if problem.max_moves <= 0:
             return None
 
-        solver, state = create_base_solver(problem.max_moves, problem.initial_state)
+        key = _problem_key(problem)
+        if key in self._transposition_table:
+            self._transposition_table.move_to_end(key)
+            return _copy_solution(self._transposition_table[key])
 
-        # Add custom constraints
-        if problem.constraints:
-            solver.add(And(problem.constraints))
+        solver, state = self._get_base_solver(problem)
 
-        if solver.check() == sat:
-            model = solver.model()
-            moves = extract_moves(model, state, problem.max_moves)
+        solution = None
+        solver.push()
+        try:
+            # Add custom constraints
+            if problem.constraints:
+                solver.add(And(problem.constraints))
 
-            return TsumeSolution(
-                moves=moves,
-                satisfied_constraints=problem.constraints,
-            )
+            if solver.check() == sat:
+                model = solver.model()
+                moves = extract_moves(model, state, problem.max_moves)
 
-        return None
+                solution = TsumeSolution(
+                    moves=moves,
+                    satisfied_constraints=problem.constraints,
+                )
+        finally:
+            solver.pop()
+
+        self._transposition_table[key] = solution
+        if len(self._transposition_table) > TRANSPOSITION_TABLE_SIZE:
+            self._transposition_table.popitem(last=False)
+        return _copy_solution(solution)
 
     def solve_with_objective(self, problem: TsumeProblem, objective_constraint: BoolRef) -> TsumeSolution | None:
         """Solve with additional objective constraint."""
         if problem.max_moves <= 0:
             return None
 
-        solver, state = create_base_solver(problem.max_moves, problem.initial_state)
+        solver, state = self._get_base_solver(problem)
 
-        # Add custom constraints
-        if problem.constraints:
-            solver.add(And(problem.constraints))
+        solver.push()
+        try:
+            # Add custom constraints
+            if problem.constraints:
+                solver.add(And(problem.constraints))
 
-        # Add objective constraint
-        solver.add(objective_constraint)
+            # Add objective constraint
+            solver.add(objective_constraint)
 
-        if solver.check() == sat:
-            model = solver.model()
-            moves = extract_moves(model, state, problem.max_moves)
+            if solver.check() == sat:
+                model = solver.model()
+                moves = extract_moves(model, state, problem.max_moves)
 
-            return TsumeSolution(
-                moves=moves,
-                satisfied_constraints=[*problem.constraints, objective_constraint],
-            )
+                return TsumeSolution(
+                    moves=moves,
+                    satisfied_constraints=[*problem.constraints, objective_constraint],
+                )
+        finally:
+            solver.pop()
 
         return None
+
+    def solve_many_objectives(
+        self,
+        problem: TsumeProblem,
+        objectives: list[BoolRef],
+    ) -> list[TsumeSolution | None]:
+        """Solve with each of several independent objective constraints, checking them concurrently.
+
+        Z3 contexts are not thread-safe, so each worker thread owns a copy of the base solver in a
+        private context and checks its share of the objectives with push/pop. Z3 releases the GIL
+        while checking, so the workers run in parallel.
+        """
+        if problem.max_moves <= 0 or not objectives:
+            return [None] * len(objectives)
+
+        _, state = self._get_base_solver(problem)
+        workers = self._get_worker_solvers(problem, min(os.cpu_count() or 1, len(objectives)))
+
+        # Translate the queries in the calling thread; only the checks run concurrently
+        shares = [
+            (
+                worker,
+                [
+                    (
+                        index,
+                        [constraint.translate(worker.ctx) for constraint in problem.constraints],
+                        objectives[index].translate(worker.ctx),
+                    )
+                    for index in range(offset, len(objectives), len(workers))
+                ],
+            )
+            for offset, worker in enumerate(workers)
+        ]
+
+        def check_share(
+            worker: Solver,
+            queries: list[tuple[int, list[BoolRef], BoolRef]],
+        ) -> list[tuple[int, ModelRef | None]]:
+            results: list[tuple[int, ModelRef | None]] = []
+            for index, constraints, objective in queries:
+                worker.push()
+                try:
+                    worker.add(*constraints, objective)
+                    results.append((index, worker.model() if worker.check() == sat else None))
+                finally:
+                    worker.pop()
+            return results
+
+        solutions: list[TsumeSolution | None] = [None] * len(objectives)
+        with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+            for results in executor.map(lambda share: check_share(*share), shares):
+                for index, model in results:
+                    if model is not None:
+                        solutions[index] = TsumeSolution(
+                            moves=extract_moves(model.translate(main_ctx()), state, problem.max_moves),
+                            satisfied_constraints=[*problem.constraints, objectives[index]],
+                        )
+        return solutions
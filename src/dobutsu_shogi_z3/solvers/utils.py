@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+from functools import lru_cache
+from itertools import batched
+from pathlib import Path
 from typing import TYPE_CHECKING
 
-from z3 import Solver, is_true
+from z3 import Solver, Z3Exception, get_version_string, is_true, parse_smt2_string
 
 from dobutsu_shogi_z3.core import (
     ColIndex,
@@ -12,6 +17,7 @@ from dobutsu_shogi_z3.core import (
     PieceId,
     PieceState,
     PieceType,
+    Player,
     Position,
     RowIndex,
     TimeIndex,
@@ -20,48 +26,157 @@ from dobutsu_shogi_z3.z3_constraints import GameRules
 from dobutsu_shogi_z3.z3_models import GameState
 
 if TYPE_CHECKING:
-    from z3.z3 import ModelRef
+    from z3.z3 import BoolRef, ModelRef
+
+# MoveVariables fields read back from a model, in extraction order
+_MOVE_FIELDS = ("piece_id", "is_drop", "from_row", "from_col", "to_row", "to_col", "captures")
+
+# On-disk cache of rule skeletons serialized as SMT-LIB2; None means $XDG_CACHE_HOME/dobutsu_shogi_z3,
+# falling back to ~/.cache/dobutsu_shogi_z3
+SKELETON_CACHE_DIR: Path | None = None
+
+# Environment variable disabling the on-disk skeleton cache when set to a non-empty value
+SKELETON_CACHE_DISABLE_ENV = "DOBUTSU_SHOGI_Z3_NO_CACHE"
+
+
+@lru_cache(maxsize=1)
+def _rules_fingerprint() -> str:
+    """Hash the package source and the Z3 version, so cached skeletons go stale with either.
+
+    Raises OSError if the package source is not available, e.g. in a bytecode-only install.
+    """
+    package_dir = Path(__file__).resolve().parents[1]
+    sources = sorted(package_dir.rglob("*.py"))
+    if not sources:
+        msg = f"No Python source found in {package_dir}"
+        raise FileNotFoundError(msg)
+
+    digest = hashlib.sha256(get_version_string().encode())
+    for source in sources:
+        digest.update(source.relative_to(package_dir).as_posix().encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def _skeleton_cache_dir() -> Path:
+    """Resolve the skeleton cache directory; raises RuntimeError if there is no home directory."""
+    if SKELETON_CACHE_DIR is not None:
+        return SKELETON_CACHE_DIR
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    return (Path(cache_home) if cache_home else Path.home() / ".cache") / "dobutsu_shogi_z3"
+
+
+def _skeleton_cache_path(max_moves: int, piece_types: tuple[tuple[PieceId, PieceType], ...]) -> Path | None:
+    """Get the cache file of the skeleton, or None if the disk cache is disabled or unavailable.
+
+    File names start with the encoding fingerprint, so files of other encodings can be pruned.
+    """
+    if os.environ.get(SKELETON_CACHE_DISABLE_ENV):
+        return None
+    try:
+        fingerprint = _rules_fingerprint()
+        cache_dir = _skeleton_cache_dir()
+    except (OSError, RuntimeError):
+        return None
+    digest = hashlib.sha256(repr(piece_types).encode()).hexdigest()[:16]
+    return cache_dir / f"skeleton_{fingerprint[:16]}_{max_moves}_{digest}.smt2"
+
+
+def _write_skeleton(cache_path: Path, constraints: tuple[BoolRef, ...]) -> None:
+    """Serialize skeleton constraints to the cache, pruning files of other encodings and ignoring I/O failures."""
+    solver = Solver()
+    solver.add(constraints)
+
+    # Write atomically so concurrent processes never read a partial file
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    current_prefix = f"skeleton_{_rules_fingerprint()[:16]}_"
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(solver.sexpr())
+        tmp_path.replace(cache_path)
+        for stale_path in cache_path.parent.glob("skeleton_*.smt2"):
+            if not stale_path.name.startswith(current_prefix):
+                stale_path.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=16)
+def _build_skeleton(
+    max_moves: int,
+    piece_types: tuple[tuple[PieceId, PieceType], ...],
+) -> tuple[GameState, tuple[BoolRef, ...]]:
+    """Build the game state and the position-independent rule constraints.
+
+    Constructing the rule formulas dominates solver setup, so they are also serialized to
+    `SKELETON_CACHE_DIR` and parsed back on later runs with the same package source and Z3
+    version. The disk cache is skipped when `SKELETON_CACHE_DISABLE_ENV` is set, and whenever
+    it cannot be fingerprinted, located, read or written.
+    """
+    state = GameState(max_moves, piece_types=dict(piece_types))
+    cache_path = _skeleton_cache_path(max_moves, piece_types)
+
+    if cache_path is not None:
+        try:
+            return state, tuple(parse_smt2_string(cache_path.read_text()))
+        except (OSError, Z3Exception):
+            pass
+
+    constraints = (
+        *state.get_basic_constraints(),
+        *GameRules.basic_constraints(state),
+        *GameRules.movement_constraints(state),
+    )
+
+    if cache_path is not None:
+        _write_skeleton(cache_path, constraints)
+
+    return state, constraints
 
 
 def create_base_solver(max_moves: int, initial_state: list[PieceState]) -> tuple[Solver, GameState]:
     """Create a solver with basic constraints."""
-    state = GameState(max_moves)
+    piece_types = tuple(sorted((ps.piece_id, ps.piece_type) for ps in initial_state))
+    state, skeleton_constraints = _build_skeleton(max_moves, piece_types)
     solver = Solver()
 
     # Add basic constraints
-    solver.add(state.get_basic_constraints())
+    solver.add(skeleton_constraints)
     solver.add(state.set_initial_position(initial_state))
-    solver.add(GameRules.basic_constraints(state))
-    solver.add(GameRules.movement_constraints(state))
 
     return solver, state
 
 
+def find_lion_id(initial_state: list[PieceState], player: Player) -> PieceId | None:
+    """Find the piece ID of the player's Lion in the initial state."""
+    for piece_state in initial_state:
+        if piece_state.piece_type == PieceType.LION and piece_state.piece_owner == player.value:
+            return piece_state.piece_id
+    return None
+
+
 def extract_moves(model: ModelRef, state: GameState, n_moves: int) -> list[MoveData]:
     """Extract move sequence from Z3 model."""
-    moves = []
+    # Evaluate all move fields in a single flat pass
+    refs = [getattr(state.moves[TimeIndex(_t)], name) for _t in range(n_moves) for name in _MOVE_FIELDS]
+    values = [model.eval(ref, model_completion=True) for ref in refs]
 
-    for _t in range(n_moves):
+    moves = []
+    for _t, fields in enumerate(batched(values, len(_MOVE_FIELDS), strict=True)):
         t = TimeIndex(_t)
-        move = state.moves[t]
+        piece_id_val, is_drop_val, from_row, from_col, to_row, to_col, captures = fields
 
-        piece_id = PieceId(model[move.piece_id].as_long())
-        piece_type_val = model[state.piece_type[piece_id]].as_long()
+        piece_id = PieceId(piece_id_val.as_long())
+        piece_type_val = model.eval(state.piece_type[piece_id], model_completion=True).as_long()
 
         move_data = MoveData(
             move_number=t,
             player="Sente" if t % 2 == 0 else "Gote",
             piece_id=piece_id,
-            is_drop=is_true(model[move.is_drop]),
-            from_=Position(
-                row=RowIndex(model[move.from_row].as_long()),
-                col=ColIndex(model[move.from_col].as_long()),
-            ),
-            to=Position(
-                row=RowIndex(model[move.to_row].as_long()),
-                col=ColIndex(model[move.to_col].as_long()),
-            ),
-            captures=model[move.captures].as_long(),
+            is_drop=is_true(is_drop_val),
+            from_=Position(row=RowIndex(from_row.as_long()), col=ColIndex(from_col.as_long())),
+            to=Position(row=RowIndex(to_row.as_long()), col=ColIndex(to_col.as_long())),
+            captures=captures.as_long(),
             piece_type=PieceType(piece_type_val),
         )
         moves.append(move_data)
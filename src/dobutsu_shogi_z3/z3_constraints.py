@@ -5,7 +5,7 @@ from __future__ import annotations
 from itertools import product
 from typing import TYPE_CHECKING
 
-from z3 import Abs, And, BoolRef, If, Implies, Not, Or
+from z3 import And, BoolRef, If, Implies, Not, Or, PbEq, PbLe
 
 from .core import PieceId, PieceType, Player, PlayerId, TimeIndex
 
@@ -26,9 +26,6 @@ class GameRules:
         # No two pieces on same square constraint
         constraints.extend(GameRules._no_overlap_constraints(state))
 
-        # Captured pieces are in someone's hand
-        constraints.extend(GameRules._capture_hand_constraints(state))
-
         # Only Chicks can be promoted
         constraints.extend(GameRules._promotion_constraints(state))
 
@@ -55,38 +52,27 @@ class GameRules:
         return constraints
 
     @staticmethod
-    def victory_conditions(state: GameState, t: TimeIndex, player: Player) -> BoolRef:
+    def victory_conditions(
+        state: GameState,
+        t: TimeIndex,
+        player: Player,
+        own_lion_id: PieceId,
+        opponent_lion_id: PieceId,
+    ) -> BoolRef:
         """Check victory conditions at time t."""
-        victory_conditions = []
-
-        for _p in range(state.N_PIECES):
-            p = PieceId(_p)
-
-            # Victory by capturing opponent's Lion
-            is_opponent_lion = And(
-                state.piece_type[p] == PieceType.LION.value,
-                state.piece_owner[t, p] != player.value,
-            )
-            victory_conditions.append(
-                And(is_opponent_lion, state.piece_captured[t, p]),
-            )
-
-            # Victory by reaching opponent's back rank
-            is_own_lion = And(
-                state.piece_type[p] == PieceType.LION.value,
-                state.piece_owner[t, p] == player.value,
-            )
-            reaches_back_rank = If(
-                player.value == Player.SENTE.value,
-                state.piece_row[t, p] == state.ROWS,
-                state.piece_row[t, p] == 1,
-            )
-            victory_conditions.append(
-                And(is_own_lion, Not(state.piece_captured[t, p]), reaches_back_rank),
-            )
-            # TODO: Own lion should not be captured in the next turn
+        # Victory by capturing opponent's Lion
+        captures_lion = state.captured(t, opponent_lion_id)
+
+        # Victory by reaching opponent's back rank
+        back_rank = state.ROWS if player == Player.SENTE else 1
+        reaches_back_rank = And(
+            state.on_board(t, own_lion_id),
+            state.eq_owner(t, own_lion_id, player),
+            state.piece_row[t, own_lion_id] == back_rank,
+        )
+        # TODO: Own lion should not be captured in the next turn
 
-        return Or(victory_conditions)
+        return Or(captures_lion, reaches_back_rank)
 
     # Private helper methods
     @staticmethod
@@ -102,8 +88,8 @@ class GameRules:
                 constraints.append(
                     Implies(
                         And(
-                            Not(state.piece_captured[t, p1]),
-                            Not(state.piece_captured[t, p2]),
+                            state.on_board(t, p1),
+                            state.on_board(t, p2),
                         ),
                         Or(
                             state.piece_row[t, p1] != state.piece_row[t, p2],
@@ -114,33 +100,24 @@ class GameRules:
 
         return constraints
 
-    @staticmethod
-    def _capture_hand_constraints(state: GameState) -> list[BoolRef]:
-        """Generate constraints for captured pieces in hand."""
-        constraints = []
-
-        for t, p in product(range(state.max_moves + 1), range(state.N_PIECES)):
-            t_idx = TimeIndex(t)
-            p_id = PieceId(p)
-            constraints.append(
-                state.piece_captured[t_idx, p_id] == (state.piece_in_hand_of[t_idx, p_id] >= 0),
-            )
-            # Doesn't this mean `piece_captured` is redundant?
-
-        return constraints
-
     @staticmethod
     def _promotion_constraints(state: GameState) -> list[BoolRef]:
-        """Only Chicks can be promoted."""
+        """Only Chicks can be promoted.
+
+        Pieces with a known type only get promotion variables if they are Chicks, so the
+        constraint is only needed for pieces whose type is left to the solver.
+        """
         constraints = []
 
         for t, p in product(range(state.max_moves + 1), range(state.N_PIECES)):
             t_idx = TimeIndex(t)
             p_id = PieceId(p)
+            if p_id in state.piece_types:
+                continue
             constraints.append(
                 Implies(
                     state.piece_promoted[t_idx, p_id],
-                    state.piece_type[p_id] == PieceType.CHICK.value,
+                    state.eq_piece_type(p_id, PieceType.CHICK),
                 ),
             )
 
@@ -150,13 +127,12 @@ class GameRules:
     def _player_ownership_constraints(state: GameState, t: TimeIndex, current_player: PlayerId) -> list[BoolRef]:
         """Generate constraints for player piece ownership."""
         constraints = []
-        move = state.moves[t]
 
         for _p in range(state.N_PIECES):
             p = PieceId(_p)
             constraints.append(
                 Implies(
-                    move.piece_id == p,
+                    state.is_moving[t, p],
                     state.piece_owner[t, p] == current_player,
                 ),
             )
@@ -173,12 +149,11 @@ class GameRules:
             p = PieceId(_p)
             constraints.append(
                 Implies(
-                    move.piece_id == p,
+                    state.is_moving[t, p],
                     If(
                         move.is_drop,
                         # Drop constraints
                         And(
-                            state.piece_captured[t, p],
                             state.piece_in_hand_of[t, p] == current_player,
                             move.from_row == 0,
                             move.from_col == 0,
@@ -187,7 +162,7 @@ class GameRules:
                         ),
                         # Regular move constraints
                         And(
-                            Not(state.piece_captured[t, p]),
+                            state.on_board(t, p),
                             move.from_row == state.piece_row[t, p],
                             move.from_col == state.piece_col[t, p],
                             GameRules._valid_move_pattern(state, t, move, p),
@@ -212,7 +187,7 @@ class GameRules:
         for _p in range(state.N_PIECES):
             p = PieceId(_p)
             occupied_by_p = And(
-                Not(state.piece_captured[t, p]),
+                state.on_board(t, p),
                 state.piece_row[t, p] == row,
                 state.piece_col[t, p] == col,
             )
@@ -234,7 +209,7 @@ class GameRules:
         for _p in range(state.N_PIECES):
             p = PieceId(_p)
             occupied_by_p = And(
-                Not(state.piece_captured[t, p]),
+                state.on_board(t, p),
                 state.piece_row[t, p] == row,
                 state.piece_col[t, p] == col,
             )
@@ -257,22 +232,23 @@ class GameRules:
         d_col = to_col - from_col
 
         # Get effective piece type (considering promotion)
-        effective_type = If(
-            state.piece_promoted[t, piece_id],
-            PieceType.HEN.value,
-            state.piece_type[piece_id],
+        effective_type = (
+            If(state.is_promoted(t, piece_id), PieceType.HEN.value, state.piece_type[piece_id])
+            if state.can_promote(piece_id)
+            else state.piece_type[piece_id]
         )
 
         # Define movement patterns
         patterns = [
+            # Every piece moves at most 1 square in each direction
+            d_row >= -1,
+            d_row <= 1,
+            d_col >= -1,
+            d_col <= 1,
             # Lion - moves 1 square in any direction
             Implies(
                 effective_type == PieceType.LION.value,
-                And(
-                    Abs(d_row) <= 1,
-                    Abs(d_col) <= 1,
-                    Or(d_row != 0, d_col != 0),
-                ),
+                Or(d_row != 0, d_col != 0),
             ),
             # Giraffe - moves 1 square orthogonally
             Implies(
@@ -285,14 +261,14 @@ class GameRules:
             # Elephant - moves 1 square diagonally
             Implies(
                 effective_type == PieceType.ELEPHANT.value,
-                And(Abs(d_row) == 1, Abs(d_col) == 1),
+                And(Or(d_row == 1, d_row == -1), Or(d_col == 1, d_col == -1)),
             ),
             # Chick - moves 1 square forward
             Implies(
                 effective_type == PieceType.CHICK.value,
                 And(
                     If(
-                        state.piece_owner[t, piece_id] == Player.SENTE.value,
+                        state.eq_owner(t, piece_id, Player.SENTE),
                         d_row == 1,
                         d_row == -1,
                     ),
@@ -309,7 +285,7 @@ class GameRules:
                     # Forward diagonal moves
                     And(
                         If(
-                            state.piece_owner[t, piece_id] == Player.SENTE.value,
+                            state.eq_owner(t, piece_id, Player.SENTE),
                             d_row == 1,
                             d_row == -1,
                         ),
@@ -329,65 +305,79 @@ class GameRules:
         next_t = TimeIndex(t + 1)
         current_player = PlayerId(t % 2)
 
-        for _p in range(state.N_PIECES):
-            p = PieceId(_p)
+        # Loop-invariant move terms
+        to_row = move.to_row
+        to_col = move.to_col
+        reaches_sente_back_rank = to_row == state.ROWS
+        reaches_gote_back_rank = to_row == 1
 
-            # Check if this piece is moving
-            is_moving = move.piece_id == p
+        piece_ids = [PieceId(_p) for _p in range(state.N_PIECES)]
 
-            # Check if this piece is captured
-            is_captured = And(move.captures == p, Not(move.is_drop))
+        # One-hot role selectors: exactly one piece moves, at most one is captured
+        moving = [state.is_moving[t, p] for p in piece_ids]
+        captured_now = [state.is_captured_now[t, p] for p in piece_ids]
+        constraints.append(PbEq([(m, 1) for m in moving], 1))
+        constraints.append(PbLe([(c, 1) for c in captured_now], 1))
+
+        for p in piece_ids:
+            row_next = state.piece_row[next_t, p]
+            col_next = state.piece_col[next_t, p]
+            promoted_next = state.is_promoted(next_t, p)
+            hand_next = state.piece_in_hand_of[next_t, p]
+            owner_next = state.piece_owner[next_t, p]
 
             # Default states
-            same_position = And(
-                state.piece_row[next_t, p] == state.piece_row[t, p],
-                state.piece_col[next_t, p] == state.piece_col[t, p],
-            )
-            same_captured = state.piece_captured[next_t, p] == state.piece_captured[t, p]
-            same_promoted = state.piece_promoted[next_t, p] == state.piece_promoted[t, p]
-            same_hand = state.piece_in_hand_of[next_t, p] == state.piece_in_hand_of[t, p]
-            same_owner = state.piece_owner[next_t, p] == state.piece_owner[t, p]
+            same_position = And(row_next == state.piece_row[t, p], col_next == state.piece_col[t, p])
+            same_promoted = promoted_next == state.is_promoted(t, p)
+            same_owner = owner_next == state.piece_owner[t, p]
+            same_snapshot = state.snapshot(next_t, p) == state.snapshot(t, p)
 
-            # Apply effects based on piece role
+            # This piece is moving
             constraints.append(
-                If(
-                    is_moving,
-                    # This piece is moving
+                Implies(
+                    moving[p],
                     And(
-                        state.piece_row[next_t, p] == move.to_row,
-                        state.piece_col[next_t, p] == move.to_col,
-                        state.piece_captured[next_t, p] == False,
-                        state.piece_in_hand_of[next_t, p] == -1,
+                        row_next == to_row,
+                        col_next == to_col,
+                        hand_next == -1,
                         same_owner,
                         # Check promotion
                         If(
                             And(
-                                state.piece_type[p] == PieceType.CHICK.value,
+                                state.eq_piece_type(p, PieceType.CHICK),
                                 Or(
-                                    And(state.piece_owner[t, p] == Player.SENTE.value, move.to_row == state.ROWS),
-                                    And(state.piece_owner[t, p] == Player.GOTE.value, move.to_row == 1),
+                                    And(state.eq_owner(t, p, Player.SENTE), reaches_sente_back_rank),
+                                    And(state.eq_owner(t, p, Player.GOTE), reaches_gote_back_rank),
                                 ),
                             ),
-                            state.piece_promoted[next_t, p] == True,
+                            promoted_next == True,
                             same_promoted,
                         ),
                     ),
-                    If(
-                        is_captured,
-                        # This piece is captured
-                        And(
-                            state.piece_captured[next_t, p] == True,
-                            state.piece_in_hand_of[next_t, p] == current_player,
-                            state.piece_promoted[next_t, p] == False,
-                            state.piece_owner[next_t, p] == current_player,
-                            same_position,
-                        ),
-                        # This piece is unaffected
-                        And(same_position, same_captured, same_promoted, same_hand, same_owner),
+                ),
+            )
+
+            # This piece is captured
+            constraints.append(
+                Implies(
+                    captured_now[p],
+                    And(
+                        hand_next == current_player,
+                        promoted_next == False,
+                        owner_next == current_player,
+                        same_position,
                     ),
                 ),
             )
 
+            # This piece is unaffected (frame axiom)
+            constraints.append(
+                Implies(
+                    And(Not(moving[p]), Not(captured_now[p])),
+                    same_snapshot,
+                ),
+            )
+
         # Capture logic
         constraints.extend(GameRules._capture_logic_constraints(state, t))
 
@@ -400,35 +390,41 @@ class GameRules:
         move = state.moves[t]
         current_player = PlayerId(t % 2)
 
+        # Loop-invariant move terms
+        to_row = move.to_row
+        to_col = move.to_col
+        captures = move.captures
+
         # Determine what piece is captured
+        no_capture_conditions = []
         for _p in range(state.N_PIECES):
             p = PieceId(_p)
+            row = state.piece_row[t, p]
+            col = state.piece_col[t, p]
+            owner = state.piece_owner[t, p]
             constraints.append(
                 Implies(
                     And(
-                        Not(state.piece_captured[t, p]),
-                        p != move.piece_id,
-                        state.piece_row[t, p] == move.to_row,
-                        state.piece_col[t, p] == move.to_col,
-                        state.piece_owner[t, p] != current_player,
+                        state.on_board(t, p),
+                        Not(state.is_moving[t, p]),
+                        row == to_row,
+                        col == to_col,
+                        owner != current_player,
                     ),
-                    move.captures == p,
+                    captures == p,
+                ),
+            )
+            no_capture_conditions.append(
+                Or(
+                    state.captured(t, p),
+                    state.is_moving[t, p],
+                    row != to_row,
+                    col != to_col,
+                    owner == current_player,
                 ),
             )
 
         # If no valid capture, set captures to -1
-        no_valid_capture = And(
-            [
-                Or(
-                    state.piece_captured[t, PieceId(p)],
-                    p == move.piece_id,
-                    state.piece_row[t, PieceId(p)] != move.to_row,
-                    state.piece_col[t, PieceId(p)] != move.to_col,
-                    state.piece_owner[t, PieceId(p)] == current_player,
-                )
-                for p in range(state.N_PIECES)
-            ],
-        )
-        constraints.append(Implies(no_valid_capture, move.captures == -1))
+        constraints.append(Implies(And(no_capture_conditions), captures == -1))
 
         return constraints
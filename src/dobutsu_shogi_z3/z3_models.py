@@ -6,15 +6,27 @@ from dataclasses import dataclass, field
 from itertools import product
 from typing import TYPE_CHECKING
 
-from z3 import Bool, Int
+from z3 import And, Bool, BoolSort, BoolVal, Datatype, Int, IntSort, Not
 
-from .core import PieceId, PieceState, PieceType, TimeIndex
+from .core import PieceId, PieceState, PieceType, Player, TimeIndex
 
 if TYPE_CHECKING:
-    from z3.z3 import ArithRef, BoolRef
-
-
-@dataclass
+    from z3.z3 import ArithRef, BoolRef, ExprRef
+
+# Tuple sort bundling the dynamic state of a single piece
+_snapshot = Datatype("PieceSnapshot")
+_snapshot.declare(
+    "snapshot",
+    ("row", IntSort()),
+    ("col", IntSort()),
+    ("promoted", BoolSort()),
+    ("in_hand", IntSort()),
+    ("owner", IntSort()),
+)
+PieceSnapshot = _snapshot.create()
+
+
+@dataclass(slots=True)
 class MoveVariables:
     """Z3 variables for a move in Dōbutsu Shōgi."""
 
@@ -33,6 +45,9 @@ class GameState:
 
     max_moves: int
 
+    # Piece types known in advance (e.g. from the initial position)
+    piece_types: dict[PieceId, PieceType] = field(default_factory=dict)
+
     # Constants
     ROWS: int = field(default=4, init=False)
     COLS: int = field(default=3, init=False)
@@ -45,13 +60,19 @@ class GameState:
     piece_owner: dict[tuple[TimeIndex, PieceId], ArithRef] = field(default_factory=dict, init=False)
     piece_row: dict[tuple[TimeIndex, PieceId], ArithRef] = field(default_factory=dict, init=False)
     piece_col: dict[tuple[TimeIndex, PieceId], ArithRef] = field(default_factory=dict, init=False)
-    piece_captured: dict[tuple[TimeIndex, PieceId], BoolRef] = field(default_factory=dict, init=False)
-    piece_promoted: dict[tuple[TimeIndex, PieceId], BoolRef] = field(default_factory=dict, init=False)
+    piece_promoted: dict[tuple[TimeIndex, PieceId], BoolRef] = field(default_factory=dict, init=False)  # Chicks only
     piece_in_hand_of: dict[tuple[TimeIndex, PieceId], ArithRef] = field(default_factory=dict, init=False)
 
     # Move variables
     moves: dict[TimeIndex, MoveVariables] = field(default_factory=dict, init=False)
 
+    # Move role atoms shared between constraint generators
+    is_moving: dict[tuple[TimeIndex, PieceId], BoolRef] = field(default_factory=dict, init=False)
+    is_captured_now: dict[tuple[TimeIndex, PieceId], BoolRef] = field(default_factory=dict, init=False)
+
+    # Lazily built atoms shared between constraint generators
+    _atom_cache: dict[tuple[object, ...], BoolRef] = field(default_factory=dict, init=False, repr=False)
+
     def __post_init__(self) -> None:
         """Initialize all Z3 variables."""
         # Static piece properties
@@ -66,9 +87,9 @@ class GameState:
             self.piece_owner[t, p] = Int(f"piece_{p}_owner_t{t}")
             self.piece_row[t, p] = Int(f"piece_{p}_row_t{t}")
             self.piece_col[t, p] = Int(f"piece_{p}_col_t{t}")
-            self.piece_captured[t, p] = Bool(f"piece_{p}_captured_t{t}")
-            self.piece_promoted[t, p] = Bool(f"piece_{p}_promoted_t{t}")
             self.piece_in_hand_of[t, p] = Int(f"piece_{p}_in_hand_t{t}")
+            if self.can_promote(p):
+                self.piece_promoted[t, p] = Bool(f"piece_{p}_promoted_t{t}")
 
         # Move variables
         for _t in range(self.max_moves):
@@ -83,13 +104,75 @@ class GameState:
                 captures=Int(f"move_{t}_captures"),
             )
 
+        # Move role atoms
+        for _t, _p in product(range(self.max_moves), range(self.N_PIECES)):
+            t = TimeIndex(_t)
+            p = PieceId(_p)
+            move = self.moves[t]
+            self.is_moving[t, p] = move.piece_id == p
+            self.is_captured_now[t, p] = And(move.captures == p, Not(move.is_drop))
+
+    def can_promote(self, p: PieceId) -> bool:
+        """Check whether piece p may be a Chick, i.e. whether it needs promotion variables."""
+        return self.piece_types.get(p, PieceType.CHICK) == PieceType.CHICK
+
+    def is_promoted(self, t: TimeIndex, p: PieceId) -> BoolRef:
+        """Get the promotion state of piece p at time t (always false for non-Chicks)."""
+        return self.piece_promoted.get((t, p), BoolVal(val=False))
+
+    def eq_piece_type(self, p: PieceId, piece_type: PieceType) -> BoolRef:
+        """Get the atom `piece_type[p] == piece_type`."""
+        key = ("piece_type", p, piece_type)
+        if key not in self._atom_cache:
+            self._atom_cache[key] = self.piece_type[p] == piece_type.value
+        return self._atom_cache[key]
+
+    def eq_owner(self, t: TimeIndex, p: PieceId, player: Player) -> BoolRef:
+        """Get the atom `piece_owner[t, p] == player`."""
+        key = ("owner", t, p, player)
+        if key not in self._atom_cache:
+            self._atom_cache[key] = self.piece_owner[t, p] == player.value
+        return self._atom_cache[key]
+
+    def captured(self, t: TimeIndex, p: PieceId) -> BoolRef:
+        """Get the atom stating that piece p is in a player's hand at time t."""
+        key = ("captured", t, p)
+        if key not in self._atom_cache:
+            self._atom_cache[key] = self.piece_in_hand_of[t, p] >= 0
+        return self._atom_cache[key]
+
+    def on_board(self, t: TimeIndex, p: PieceId) -> BoolRef:
+        """Get the atom stating that piece p is on the board at time t."""
+        key = ("on_board", t, p)
+        if key not in self._atom_cache:
+            self._atom_cache[key] = self.piece_in_hand_of[t, p] < 0
+        return self._atom_cache[key]
+
+    def snapshot(self, t: TimeIndex, p: PieceId) -> ExprRef:
+        """Pack the dynamic state of piece p at time t into a single datatype value."""
+        return PieceSnapshot.snapshot(
+            self.piece_row[t, p],
+            self.piece_col[t, p],
+            self.is_promoted(t, p),
+            self.piece_in_hand_of[t, p],
+            self.piece_owner[t, p],
+        )
+
     def get_basic_constraints(self) -> list[BoolRef]:
-        """Get basic domain constraints for all variables."""
+        """Get basic domain constraints for all variables.
+
+        Pieces listed in `piece_types` are expected to be pinned by `set_initial_position`, and
+        the move rules only ever assign in-domain values to their state. For those pieces, the
+        type bounds are skipped and the state bounds are only asserted at t=0.
+        """
         constraints = []
+        pinned = self.piece_types.keys()
 
         # Piece type constraints
         for _p in range(self.N_PIECES):
             piece_id = PieceId(_p)
+            if piece_id in pinned:
+                continue
             constraints.extend(
                 [
                     self.piece_type[piece_id] >= PieceType.min_value_basic(),
@@ -101,6 +184,8 @@ class GameState:
         for _t, _p in product(range(self.max_moves + 1), range(self.N_PIECES)):
             t = TimeIndex(_t)
             p = PieceId(_p)
+            if t > 0 and p in pinned:
+                continue
             constraints.extend(
                 [
                     # Owner constraints
@@ -161,8 +246,7 @@ class GameState:
                     self.piece_owner[t, piece_id] == piece_state.piece_owner,
                     self.piece_row[t, piece_id] == piece_state.row,
                     self.piece_col[t, piece_id] == piece_state.col,
-                    self.piece_captured[t, piece_id] == False,
-                    self.piece_promoted[t, piece_id] == False,
+                    self.is_promoted(t, piece_id) == False,
                     self.piece_in_hand_of[t, piece_id] == -1,  # On board
                 ],
             )
@@ -2,20 +2,41 @@
 
 from __future__ import annotations
 
+from itertools import batched, product
+from typing import TYPE_CHECKING
+
 import pytest
-from z3 import Solver, sat
+from z3 import And, Bool, Or, Solver, sat, unsat
 
 from dobutsu_shogi_z3.constants import DEFAULT_INITIAL_SETUP
-from dobutsu_shogi_z3.core import Player, TimeIndex
+from dobutsu_shogi_z3.core import PieceId, Player, TimeIndex
+from dobutsu_shogi_z3.solvers.utils import find_lion_id
 from dobutsu_shogi_z3.z3_constraints import GameRules
 from dobutsu_shogi_z3.z3_models import GameState
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
-@pytest.fixture
-def solver() -> tuple[Solver, GameState]:
-    """Create a solver with basic game constraints."""
-    state = GameState(max_moves=10)
+    from z3 import BoolRef
+
+
+# Moves the shared solver is built for; enough for every test inspecting t=0 and t=1
+DEFAULT_DEPTH = 2
+
+
+@pytest.fixture(scope="module")
+def base_solver(request: pytest.FixtureRequest) -> tuple[Solver, GameState]:
+    """Create a solver with basic game constraints, shared by all tests in the module.
+
+    Tests needing more moves can request a deeper solver with
+    `@pytest.mark.parametrize("base_solver", [depth], indirect=True)`.
+    """
+    state = GameState(max_moves=getattr(request, "param", DEFAULT_DEPTH))
     solver = Solver()
+    # Skip Z3's per-check tactic selection; setting relevancy=0 as well measured slower here
+    solver.set(auto_config=False)
+    # Make a regressed encoding fail with `unknown` instead of hanging; a check here needs ~0.2M rlimit
+    solver.set(timeout=5000, rlimit=100_000_000)
 
     # Add basic constraints
     solver.add(state.get_basic_constraints())
@@ -26,38 +47,74 @@ def solver() -> tuple[Solver, GameState]:
     return solver, state
 
 
-def test_initial_board_setup(solver: tuple[Solver, GameState]) -> None:
-    """Test that the initial board setup is satisfiable."""
-    s, state = solver
+@pytest.fixture
+def solver(base_solver: tuple[Solver, GameState]) -> Iterator[tuple[Solver, GameState]]:
+    """Open a solver scope for a single test, so its constraints are discarded afterwards."""
+    s, _ = base_solver
+    s.push()
+    try:
+        yield base_solver
+    finally:
+        s.pop()
+
+
+@pytest.fixture(scope="module")
+def initial_board(base_solver: tuple[Solver, GameState]) -> dict[PieceId, tuple[int, ...]]:
+    """Solve the initial position once and freeze each piece's (row, col, type, owner) at t=0."""
+    s, state = base_solver
 
     # Should be able to find a satisfying assignment
     assert s.check() == sat
     model = s.model()
 
-    # Verify some basic properties of the initial state
+    # Evaluate every (row, col, type, owner) term in one flat pass, then split per piece
     t = TimeIndex(0)
+    piece_ids = [PieceId(_p) for _p in range(state.N_PIECES)]
+    exprs = [
+        expr
+        for p in piece_ids
+        for expr in (state.piece_row[t, p], state.piece_col[t, p], state.piece_type[p], state.piece_owner[t, p])
+    ]
+    values = [model.eval(expr, model_completion=True).as_long() for expr in exprs]
 
-    # Check that pieces are at expected positions
-    for piece_state in DEFAULT_INITIAL_SETUP:
-        piece_id = piece_state.piece_id
+    return dict(zip(piece_ids, batched(values, 4, strict=True), strict=True))
+
+
+@pytest.fixture(scope="module")
+def dest_lit(base_solver: tuple[Solver, GameState]) -> dict[tuple[int, int], BoolRef]:
+    """Define one assumption literal per destination square of the first move.
+
+    Checking `s.check(dest_lit[row, col])` selects a destination without adding and retracting
+    constraints, and lets Z3 keep what it learned between queries.
+    """
+    s, state = base_solver
+    move = state.moves[TimeIndex(0)]
+
+    literals = {}
+    for row, col in product(range(1, state.ROWS + 1), range(1, state.COLS + 1)):
+        literal = Bool(f"dest_{row}_{col}")
+        s.add(literal == And(move.to_row == row, move.to_col == col))
+        literals[row, col] = literal
+
+    return literals
 
-        # Check position
-        row = model[state.piece_row[t, piece_id]].as_long()
-        col = model[state.piece_col[t, piece_id]].as_long()
+
+def test_initial_board_setup(initial_board: dict[PieceId, tuple[int, ...]]) -> None:
+    """Test that the initial board setup is satisfiable."""
+    # Check that pieces are at expected positions, with expected types and owners
+    for piece_state in DEFAULT_INITIAL_SETUP:
+        row, col, piece_type, owner = initial_board[piece_state.piece_id]
 
         assert row == piece_state.row
         assert col == piece_state.col
-
-        # Check piece type
-        piece_type = model[state.piece_type[piece_id]].as_long()
         assert piece_type == piece_state.piece_type.value
-
-        # Check ownership
-        owner = model[state.piece_owner[t, piece_id]].as_long()
         assert owner == piece_state.piece_owner
 
 
-def test_basic_movement_constraints(solver: tuple[Solver, GameState]) -> None:
+def test_basic_movement_constraints(
+    solver: tuple[Solver, GameState],
+    dest_lit: dict[tuple[int, int], BoolRef],
+) -> None:
     """Test that movement constraints are properly applied."""
     s, state = solver
 
@@ -66,10 +123,8 @@ def test_basic_movement_constraints(solver: tuple[Solver, GameState]) -> None:
 
     # Try to move Sente's chick forward
     s.add(move.piece_id == 3)  # Sente's chick
-    s.add(move.to_row == 3)  # Move forward
-    s.add(move.to_col == 2)  # Same column
 
-    assert s.check() == sat, "Legal chick move should be satisfiable"
+    assert s.check(dest_lit[3, 2]) == sat, "Legal chick move should be satisfiable"
 
 
 def test_victory_conditions(solver: tuple[Solver, GameState]) -> None:
@@ -77,30 +132,58 @@ def test_victory_conditions(solver: tuple[Solver, GameState]) -> None:
     s, state = solver
 
     # Test victory condition evaluation
-    victory_sente = GameRules.victory_conditions(state, TimeIndex(1), Player.SENTE)
-    victory_gote = GameRules.victory_conditions(state, TimeIndex(1), Player.GOTE)
+    sente_lion = find_lion_id(DEFAULT_INITIAL_SETUP, Player.SENTE)
+    gote_lion = find_lion_id(DEFAULT_INITIAL_SETUP, Player.GOTE)
+    assert sente_lion is not None
+    assert gote_lion is not None
+    victory_sente = GameRules.victory_conditions(state, TimeIndex(1), Player.SENTE, sente_lion, gote_lion)
+    victory_gote = GameRules.victory_conditions(state, TimeIndex(1), Player.GOTE, gote_lion, sente_lion)
 
     # Should be able to create these expressions without error
     assert victory_sente is not None
     assert victory_gote is not None
 
 
-def test_piece_movement_patterns(solver: tuple[Solver, GameState]) -> None:
+# Sente's chick captures Gote's chick at t=0 and can take Gote's Lion at t=2
+@pytest.mark.parametrize("base_solver", [3], indirect=True)
+def test_victory_by_lion_capture(solver: tuple[Solver, GameState]) -> None:
+    """Test that capturing the opponent's Lion wins, and not losing one's own."""
+    s, state = solver
+    t = TimeIndex(3)
+
+    sente_lion = find_lion_id(DEFAULT_INITIAL_SETUP, Player.SENTE)
+    gote_lion = find_lion_id(DEFAULT_INITIAL_SETUP, Player.GOTE)
+    assert sente_lion is not None
+    assert gote_lion is not None
+    victory_sente = GameRules.victory_conditions(state, t, Player.SENTE, sente_lion, gote_lion)
+    victory_gote = GameRules.victory_conditions(state, t, Player.GOTE, gote_lion, sente_lion)
+
+    # Force Sente to have captured Gote's Lion
+    s.add(state.captured(t, gote_lion))
+
+    assert s.check(victory_sente) == sat, "Capturing the opponent's Lion should be a victory"
+    assert s.check(victory_gote) == unsat, "Losing one's own Lion should not be a victory"
+
+
+def test_piece_movement_patterns(
+    solver: tuple[Solver, GameState],
+    dest_lit: dict[tuple[int, int], BoolRef],
+) -> None:
     """Test that piece movement patterns are correctly enforced."""
     s, state = solver
 
     # Test chick movement - should only move forward
     move = state.moves[TimeIndex(0)]
+    s.add(move.piece_id == 3)  # Sente's chick at (2, 2)
 
-    # Sente's chick moving backward should be unsatisfiable
-    test_solver = Solver()
-    test_solver.add(s.assertions())
-    test_solver.add(move.piece_id == 3)  # Sente's chick
-    test_solver.add(move.to_row == 1)  # Move backward
-    test_solver.add(move.to_col == 2)  # Same column
-    test_solver.add(move.captures == -1)  # No capture
+    # Every non-capturing destination other than straight forward should be unsatisfiable, checked in
+    # one query; passing the scenario as assumptions leaves nothing behind if the assertion fails
+    other_destination = Or(move.to_row != move.from_row + 1, move.to_col != move.from_col)
+    no_capture = move.captures == -1
+    assert s.check(other_destination, no_capture) == unsat, "Chick should only be able to move forward"
 
-    assert test_solver.check() != sat, "Chick should not be able to move backward"
+    # Moving forward (capturing Gote's chick) should be satisfiable
+    assert s.check(dest_lit[3, 2]) == sat, "Chick should be able to move forward"
 
 
 def test_turn_alternation(solver: tuple[Solver, GameState]) -> None:
@@ -131,18 +214,20 @@ def test_no_piece_overlap(solver: tuple[Solver, GameState]) -> None:
     assert s.check() == sat, "Basic constraints should be satisfiable"
 
 
-def test_capture_mechanics_basic(solver: tuple[Solver, GameState]) -> None:
+def test_capture_mechanics_basic(
+    solver: tuple[Solver, GameState],
+    dest_lit: dict[tuple[int, int], BoolRef],
+) -> None:
     """Test basic capture mechanics."""
     s, state = solver
 
     # Set up a capture scenario
     move = state.moves[TimeIndex(0)]
     s.add(move.piece_id == 3)  # Sente's chick
-    s.add(move.to_row == 3)  # Move to row 3
-    s.add(move.to_col == 2)  # Column 2 (where Gote's chick is)
     s.add(move.captures == 7)  # Capture Gote's chick
 
-    assert s.check() == sat, "Capture should be possible"
+    # Move to row 3, column 2 (where Gote's chick is)
+    assert s.check(dest_lit[3, 2]) == sat, "Capture should be possible"
 
 
 def test_promotion_constraints(solver: tuple[Solver, GameState]) -> None:
@@ -0,0 +1,86 @@
+"""Test cases for the shared solver utilities."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from z3 import Or, Solver, sat
+
+from dobutsu_shogi_z3.constants import DEFAULT_INITIAL_SETUP
+from dobutsu_shogi_z3.solvers import utils
+from dobutsu_shogi_z3.solvers.utils import create_base_solver
+from dobutsu_shogi_z3.z3_constraints import GameRules
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from dobutsu_shogi_z3.z3_models import GameState
+
+
+@pytest.fixture
+def skeleton_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Redirect the skeleton disk cache to a temporary directory with a cold in-memory cache."""
+    monkeypatch.setattr(utils, "SKELETON_CACHE_DIR", tmp_path)
+    monkeypatch.delenv(utils.SKELETON_CACHE_DISABLE_ENV, raising=False)
+    utils._build_skeleton.cache_clear()  # noqa: SLF001
+    yield tmp_path
+    utils._build_skeleton.cache_clear()  # noqa: SLF001
+
+
+def all_move_sequences(s: Solver, state: GameState) -> set[tuple[tuple[int, int, int], ...]]:
+    """Enumerate every legal sequence of (piece, destination row, destination column)."""
+    fields = [(move.piece_id, move.to_row, move.to_col) for move in state.moves.values()]
+    sequences = set()
+    s.push()
+    try:
+        while s.check() == sat:
+            model = s.model()
+            sequence = tuple(
+                tuple(model.eval(field, model_completion=True).as_long() for field in move_fields)
+                for move_fields in fields
+            )
+            sequences.add(sequence)
+            # Block this sequence so the next check finds a different one
+            differs = [
+                field != value
+                for move_fields, values in zip(fields, sequence, strict=True)
+                for field, value in zip(move_fields, values, strict=True)
+            ]
+            s.add(Or(differs))
+    finally:
+        s.pop()
+    return sequences
+
+
+def test_skeleton_cache_round_trip(skeleton_cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a skeleton parsed back from disk allows exactly the same moves."""
+    stale_path = skeleton_cache_dir / "skeleton_0000000000000000_2_0000000000000000.smt2"
+    stale_path.write_text("")
+
+    built_solver, built_state = create_base_solver(2, DEFAULT_INITIAL_SETUP)
+    cache_files = list(skeleton_cache_dir.glob("skeleton_*.smt2"))
+    assert len(cache_files) == 1, "Skeleton should be written and stale files pruned"
+    assert not stale_path.exists()
+
+    # Reloading must come from the file, not from rebuilding the rules
+    utils._build_skeleton.cache_clear()  # noqa: SLF001
+
+    def fail_to_rebuild(*_args: object) -> None:
+        pytest.fail("Skeleton was rebuilt instead of read from disk")
+
+    monkeypatch.setattr(GameRules, "movement_constraints", fail_to_rebuild)
+    loaded_solver, loaded_state = create_base_solver(2, DEFAULT_INITIAL_SETUP)
+
+    expected = all_move_sequences(built_solver, built_state)
+    assert expected
+    assert all_move_sequences(loaded_solver, loaded_state) == expected
+
+
+def test_skeleton_cache_disabled(skeleton_cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the opt-out environment variable keeps the skeleton off disk."""
+    monkeypatch.setenv(utils.SKELETON_CACHE_DISABLE_ENV, "1")
+    s, _ = create_base_solver(1, DEFAULT_INITIAL_SETUP)
+    assert s.check() == sat
+    assert not list(skeleton_cache_dir.iterdir())
@@ -0,0 +1,77 @@
+"""Test cases for the Tsume solver."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from z3 import BoolVal
+
+from dobutsu_shogi_z3.constants import DEFAULT_INITIAL_SETUP
+from dobutsu_shogi_z3.core import TimeIndex
+from dobutsu_shogi_z3.solvers import tsume, utils
+from dobutsu_shogi_z3.solvers.tsume import TsumeProblem, TsumeSolver
+from dobutsu_shogi_z3.z3_models import GameState
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture(autouse=True)
+def skeleton_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep skeletons written by the solver out of the user's cache directory."""
+    monkeypatch.setattr(utils, "SKELETON_CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+def test_solve_many_objectives_matches_sequential() -> None:
+    """Test that concurrently checked objectives agree with checking them one by one."""
+    problem = TsumeProblem(initial_state=DEFAULT_INITIAL_SETUP, constraints=[], max_moves=1)
+    first_piece = GameState(max_moves=1).moves[TimeIndex(0)].piece_id
+
+    # Only Sente's unblocked pieces (Lion, Giraffe and Chick) can make the first move
+    movable = [False, True, True, True, False, False, False, False]
+    objectives = [first_piece == p for p in range(8)]
+
+    tsume_solver = TsumeSolver()
+    concurrent = tsume_solver.solve_many_objectives(problem, objectives)
+    sequential = [tsume_solver.solve_with_objective(problem, objective) for objective in objectives]
+
+    assert [solution is not None for solution in concurrent] == movable
+    assert [solution is not None for solution in concurrent] == [solution is not None for solution in sequential]
+    for p, solution in enumerate(concurrent):
+        if solution is not None:
+            assert solution.moves[0].piece_id == p
+            assert solution.satisfied_constraints == [objectives[p]]
+
+
+def test_tsume_cached_solution_is_not_shared() -> None:
+    """Test that mutating a returned solution does not affect later cache hits."""
+    problem = TsumeProblem(initial_state=DEFAULT_INITIAL_SETUP, constraints=[], max_moves=1)
+    tsume_solver = TsumeSolver()
+
+    first = tsume_solver.solve(problem)
+    assert first is not None
+    first.moves.clear()
+    first.satisfied_constraints.append(BoolVal(val=False))
+
+    second = tsume_solver.solve(problem)
+    assert second is not None
+    assert len(second.moves) == 1
+    assert second.satisfied_constraints == []
+
+
+def test_tsume_evicts_worker_solvers_with_base_solver(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the solver cache stays bounded and drops worker copies of evicted positions."""
+    monkeypatch.setattr(tsume, "BASE_SOLVER_CACHE_SIZE", 1)
+    first = TsumeProblem(initial_state=DEFAULT_INITIAL_SETUP, constraints=[], max_moves=1)
+    second = TsumeProblem(initial_state=DEFAULT_INITIAL_SETUP, constraints=[], max_moves=2)
+    first_piece = GameState(max_moves=1).moves[TimeIndex(0)].piece_id
+    tsume_solver = TsumeSolver()
+
+    tsume_solver.solve_many_objectives(first, [first_piece == 1, first_piece == 2])
+    assert tsume_solver._worker_solvers  # noqa: SLF001
+
+    assert tsume_solver.solve(second) is not None
+    assert len(tsume_solver._base_solvers) == 1  # noqa: SLF001
+    assert not tsume_solver._worker_solvers  # noqa: SLF001